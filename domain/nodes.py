@@ -1,6 +1,9 @@
+import logging
 from abc import ABC, abstractmethod
 from typing import Dict, List
 
+logger = logging.getLogger(__name__)
+
 
 class Node(ABC):
     @property
@@ -49,8 +52,8 @@ def get_all_nodes(nodes: List[Node]) -> Dict[str, Node]:
         node_name = getattr(node, "name", None)
         if node_name:
             if node_name in all_nodes:
-                print(f" Warning: Duplicate node name '{node_name}' found")
+                logger.warning("Duplicate node name '%s' found", node_name)
             all_nodes[node_name] = node
-            print(f"Registered node: {node_name}")
+            logger.info("Registered node: %s", node_name)
 
     return all_nodes
@@ -1,8 +1,11 @@
+import logging
 from abc import ABC, abstractmethod
 from typing import List, Dict
 
 from .nodes import ExampleNode, Node, SentimentNode
 
+logger = logging.getLogger(__name__)
+
 
 class Plugin(ABC):
     @abstractmethod
@@ -42,7 +45,7 @@ def get_plugin_info(plugin: Plugin) -> Dict:
             }
             info["nodes"].append(node_info)
     except Exception as e:
-        print(f"Error getting node info for plugin: {e}")
+        logger.error("Error getting node info for plugin: %s", e)
 
     plugin_info.append(info)
 
@@ -75,7 +78,7 @@ def get_plugins_info(plugins: List[Plugin]) -> List[Dict]:
                 }
                 info["nodes"].append(node_info)
         except Exception as e:
-            print(f"Error getting node info for plugin: {e}")
+            logger.error("Error getting node info for plugin: %s", e)
 
         plugin_info.append(info)
 
@@ -0,0 +1,377 @@
+import gc
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_TRUE_VALUES = ("1", "true", "yes")
+
+
+class NodeResourceError(Exception):
+    """Raised when a node call violates a configured resource guard."""
+
+
+class NodeDisabledError(NodeResourceError):
+    """Raised when a node was disabled after tripping the memory alert."""
+
+
+class NodeStats:
+    """Aggregated resource usage for a single node."""
+
+    def __init__(self, alloc_window: int):
+        self.calls = 0
+        self.errors = 0
+        self.guard_violations = 0
+        self.cpu_time_s = 0.0
+        self.wall_time_s = 0.0
+        self.max_wall_time_s = 0.0
+        self.request_bytes = 0
+        self.responses = 0
+        self.response_bytes = 0
+        self.max_response_bytes = 0
+        self.alloc_samples = 0
+        self.alloc_peak_bytes: Optional[int] = None
+        # Retained bytes of the most recent sampled calls, used for the trend
+        self.alloc_retained: Deque[int] = deque(maxlen=alloc_window)
+        self.memory_alert = False
+        self.disabled = False
+
+    def reset_alloc(self):
+        """Forget the allocation trend and lift any memory alert."""
+        self.alloc_retained.clear()
+        self.memory_alert = False
+        self.disabled = False
+
+    def estimated_growth(self, alloc_interval: int) -> int:
+        """
+        Estimate the node's memory growth over the calls the window covers.
+
+        The largest sample is left out so that a single one-off allocation,
+        such as a cache warmed on first use, is not mistaken for growth.
+        """
+        window = sorted(self.alloc_retained)
+        if not window:
+            return 0
+        trimmed = window[:-1] or window
+        mean = sum(trimmed) / len(trimmed)
+        return round(mean * len(window) * max(alloc_interval, 1))
+
+    def to_dict(self, alloc_interval: int) -> Dict[str, Any]:
+        calls = self.calls or 1
+        retained = list(self.alloc_retained)
+        avg_retained = sum(retained) / len(retained) if retained else 0
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "guard_violations": self.guard_violations,
+            "cpu_time_ms": round(self.cpu_time_s * 1000, 3),
+            "avg_cpu_time_ms": round(self.cpu_time_s * 1000 / calls, 3),
+            "wall_time_ms": round(self.wall_time_s * 1000, 3),
+            "avg_wall_time_ms": round(self.wall_time_s * 1000 / calls, 3),
+            "max_wall_time_ms": round(self.max_wall_time_s * 1000, 3),
+            "request_bytes": self.request_bytes,
+            "responses": self.responses,
+            "avg_response_bytes": round(self.response_bytes / (self.responses or 1)),
+            "max_response_bytes": self.max_response_bytes,
+            "alloc_samples": self.alloc_samples,
+            "alloc_avg_retained_bytes": round(avg_retained),
+            "alloc_growth_bytes": self.estimated_growth(alloc_interval),
+            "alloc_peak_bytes": self.alloc_peak_bytes,
+            "memory_alert": self.memory_alert,
+            "disabled": self.disabled,
+        }
+
+
+class _CallTracer:
+    """
+    tracemalloc bookkeeping for a single sampled node call.
+
+    Retained memory is what is still allocated once the result has been
+    rendered and released, minus the rendered response itself. A full garbage
+    collection runs before that measurement: it frees cyclic garbage and
+    empties CPython's free lists, which otherwise hold on to freed containers
+    and would show up as retained memory.
+    """
+
+    def __init__(self):
+        self.already_tracing = tracemalloc.is_tracing()
+        # reset_peak needs Python 3.9+
+        self.can_reset_peak = hasattr(tracemalloc, "reset_peak")
+        self.before = 0
+        self.after_call = 0
+        self.after_render = 0
+        self.peak: Optional[int] = None
+
+    def start(self):
+        if not self.already_tracing:
+            tracemalloc.start()
+        elif self.can_reset_peak:
+            tracemalloc.reset_peak()
+        self.before, _ = tracemalloc.get_traced_memory()
+
+    def called(self):
+        self.after_call, peak = tracemalloc.get_traced_memory()
+        # The peak is only meaningful if it was reset when this call started
+        if not self.already_tracing or self.can_reset_peak:
+            self.peak = peak - self.before
+
+    def rendered(self):
+        self.after_render, _ = tracemalloc.get_traced_memory()
+
+    def released(self):
+        """Return (retained, peak) once the result has been released."""
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+        response = self.after_render - self.after_call
+        return current - self.before - response, self.peak
+
+    def stop(self):
+        if not self.already_tracing:
+            tracemalloc.stop()
+
+
+class ResourceAccountant:
+    """
+    Track CPU time, wall time, payload sizes and allocations per node.
+
+    Allocation tracking uses tracemalloc on a sample of calls only, since
+    tracing every allocation is too expensive for the hot path. For each
+    sampled call, the memory still allocated once the result has been
+    rendered and released is counted as retained by the node. A node trips
+    the memory alert when the net growth over the alert window, extrapolated
+    to the unsampled calls, exceeds memory_alert_bytes.
+
+    Response sizes are taken from the rendered body, so results are only
+    serialized once.
+
+    Args:
+        enabled: Whether accounting is active at all
+        alloc_sample_rate: Fraction of calls traced with tracemalloc (0 disables)
+        max_response_bytes: Reject responses whose body is larger than this
+        memory_alert_bytes: Alert once a node's estimated growth over the
+            alert window exceeds this many bytes
+        alloc_window: Number of sampled calls in the alert window
+        disable_on_memory_alert: Refuse further calls to a node after its
+            memory alert fires, until reset_node is called
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        alloc_sample_rate: float = 0.01,
+        max_response_bytes: Optional[int] = None,
+        memory_alert_bytes: Optional[int] = None,
+        alloc_window: int = 10,
+        disable_on_memory_alert: bool = False,
+    ):
+        self.enabled = enabled
+        self.alloc_interval = (
+            max(1, round(1 / min(alloc_sample_rate, 1.0)))
+            if alloc_sample_rate > 0
+            else 0
+        )
+        self.max_response_bytes = max_response_bytes
+        self.memory_alert_bytes = memory_alert_bytes
+        self.alloc_window = max(1, alloc_window)
+        self.disable_on_memory_alert = disable_on_memory_alert
+        self.stats: Dict[str, NodeStats] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ResourceAccountant":
+        """
+        Build an accountant from NOXUS_* environment variables.
+
+        Raises:
+            ValueError: If a variable is malformed
+        """
+
+        def parse(name: str, convert, default=None):
+            value = os.environ.get(name)
+            if not value:
+                return default
+            try:
+                return convert(value)
+            except ValueError:
+                raise ValueError(f"Invalid {name}: '{value}'") from None
+
+        def flag(name: str) -> bool:
+            return os.environ.get(name, "").lower() in _TRUE_VALUES
+
+        return cls(
+            enabled=flag("NOXUS_ACCOUNTING"),
+            alloc_sample_rate=parse("NOXUS_ACCOUNTING_ALLOC_SAMPLE_RATE", float, 0.01),
+            max_response_bytes=parse("NOXUS_MAX_RESPONSE_BYTES", int),
+            memory_alert_bytes=parse("NOXUS_MEMORY_ALERT_BYTES", int),
+            alloc_window=parse("NOXUS_MEMORY_ALERT_WINDOW", int, 10),
+            disable_on_memory_alert=flag("NOXUS_DISABLE_ON_MEMORY_ALERT"),
+        )
+
+    def _node_stats(self, node_name: str) -> NodeStats:
+        stats = self.stats.get(node_name)
+        if stats is None:
+            with self._lock:
+                stats = self.stats.setdefault(
+                    node_name, NodeStats(alloc_window=self.alloc_window)
+                )
+        return stats
+
+    def _record_alloc(
+        self, node_name: str, stats: NodeStats, retained: int, peak: Optional[int]
+    ):
+        stats.alloc_samples += 1
+        stats.alloc_retained.append(retained)
+        if peak is not None:
+            stats.alloc_peak_bytes = max(stats.alloc_peak_bytes or 0, peak)
+
+        if (
+            self.memory_alert_bytes is None
+            or stats.memory_alert
+            or len(stats.alloc_retained) < self.alloc_window
+        ):
+            return
+
+        growth = stats.estimated_growth(self.alloc_interval)
+        if growth > self.memory_alert_bytes:
+            stats.memory_alert = True
+            stats.disabled = self.disable_on_memory_alert
+            logger.warning(
+                "Node '%s' grew by an estimated %d bytes over its last %d sampled "
+                "calls (limit %d)%s",
+                node_name,
+                growth,
+                len(stats.alloc_retained),
+                self.memory_alert_bytes,
+                "; node disabled" if stats.disabled else "",
+            )
+
+    def _record_response(self, node_name: str, stats: NodeStats, response_bytes: int):
+        stats.responses += 1
+        stats.response_bytes += response_bytes
+        stats.max_response_bytes = max(stats.max_response_bytes, response_bytes)
+
+        if (
+            self.max_response_bytes is not None
+            and response_bytes > self.max_response_bytes
+        ):
+            stats.guard_violations += 1
+            logger.warning(
+                "Node '%s' response of %d bytes exceeds limit of %d bytes",
+                node_name,
+                response_bytes,
+                self.max_response_bytes,
+            )
+            raise NodeResourceError(
+                f"Response of {response_bytes} bytes exceeds limit of "
+                f"{self.max_response_bytes} bytes"
+            )
+
+    def call_node(
+        self,
+        node_name: str,
+        node,
+        inputs: Dict[str, Any],
+        render: Callable[[Any], Any],
+        request_bytes: Optional[int] = None,
+    ) -> Any:
+        """
+        Call a node with validated inputs and render its result, recording
+        resource usage.
+
+        Args:
+            node_name: Name the node is registered under
+            node: Node instance to call
+            inputs: Validated keyword arguments for node.call
+            render: Turns the node result into a response whose `body`
+                attribute holds the encoded bytes sent to the client
+            request_bytes: Size of the request body, if known
+
+        Returns:
+            The rendered response
+
+        Raises:
+            NodeDisabledError: If the node was disabled by the memory alert
+            NodeResourceError: If the body exceeds max_response_bytes
+        """
+        if not self.enabled:
+            return render(node.call(**inputs))
+
+        stats = self._node_stats(node_name)
+        if stats.disabled:
+            raise NodeDisabledError(
+                f"Node '{node_name}' is disabled after exceeding its memory limit"
+            )
+
+        stats.calls += 1
+        if request_bytes is not None:
+            stats.request_bytes += request_bytes
+        # The first call is never sampled, so lazy initialisation is not
+        # mistaken for growth
+        sampled = (
+            self.alloc_interval > 0
+            and stats.calls > 1
+            and (stats.calls - 1) % self.alloc_interval == 0
+        )
+
+        tracer = _CallTracer() if sampled else None
+        try:
+            if tracer:
+                tracer.start()
+
+            cpu_start = time.thread_time()
+            wall_start = time.perf_counter()
+            try:
+                result = node.call(**inputs)
+            except Exception:
+                stats.errors += 1
+                raise
+            finally:
+                wall_time = time.perf_counter() - wall_start
+                stats.cpu_time_s += time.thread_time() - cpu_start
+                stats.wall_time_s += wall_time
+                stats.max_wall_time_s = max(stats.max_wall_time_s, wall_time)
+
+            if tracer:
+                tracer.called()
+            response = render(result)
+            if tracer:
+                tracer.rendered()
+            # Drop the result so only memory the node kept hold of remains
+            del result
+            if tracer:
+                self._record_alloc(node_name, stats, *tracer.released())
+        finally:
+            if tracer:
+                tracer.stop()
+
+        self._record_response(node_name, stats, len(response.body))
+        return response
+
+    def reset_node(self, node_name: str) -> bool:
+        """
+        Lift a node's memory alert and re-enable it.
+
+        Returns:
+            False if no stats exist for the node
+        """
+        stats = self.stats.get(node_name)
+        if stats is None:
+            return False
+        stats.reset_alloc()
+        logger.info("Node '%s' memory alert reset", node_name)
+        return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return aggregated stats for all nodes."""
+        return {
+            "enabled": self.enabled,
+            "nodes": {
+                name: stats.to_dict(self.alloc_interval)
+                for name, stats in self.stats.items()
+            },
+        }
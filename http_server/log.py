@@ -0,0 +1,212 @@
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+# Loggers routed through the queue so that writing to a slow stdout pipe never
+# blocks the event loop. uvicorn is included so its error log goes the same way.
+NOXUS_LOGGERS = ("domain", "http_server", "uvicorn")
+ACCESS_LOGGER = "http_server.access"
+
+# Level names understood by both the logging module and uvicorn
+LOG_LEVELS = ("critical", "error", "warning", "info", "debug")
+DEFAULT_LEVEL = "info"
+
+# Attributes present on every LogRecord; anything else was passed via `extra`.
+# uvicorn adds `color_message`, an ANSI-colored duplicate of the message.
+_RESERVED_ATTRS = set(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__.keys()
+) | {"message", "asctime", "color_message"}
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Format log records as single-line JSON objects."""
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str = None) -> str:
+        """Format the record time as ISO 8601 in UTC, with milliseconds."""
+        created = datetime.fromtimestamp(record.created, tz=timezone.utc)
+        return created.isoformat(timespec="milliseconds")
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith("_"):
+                entry[key] = value
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+
+        return json.dumps(entry, default=str)
+
+
+class StructuredQueueHandler(QueueHandler):
+    """
+    QueueHandler that keeps tracebacks out of the message.
+
+    The stock handler formats the record into `msg` before enqueueing it,
+    which folds any traceback into the message. Here only the message is
+    merged with its args; the traceback is rendered into `exc_text` so that
+    JsonFormatter can emit it as a separate field.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class NodeLogSampler:
+    """
+    Decide which per-request log records are emitted for each node.
+
+    A rate of 1.0 logs every request, 0.1 logs one request in ten and 0
+    disables access logging for the node. Sampling is deterministic (every
+    Nth request) so it costs a counter increment on the hot path.
+    """
+
+    def __init__(self, default_rate: float = 1.0, rates: Dict[str, float] = None):
+        self.default_rate = default_rate
+        self.rates = dict(rates or {})
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _interval(self, node_name: str) -> int:
+        rate = self.rates.get(node_name, self.default_rate)
+        if rate <= 0:
+            return 0
+        return max(1, round(1 / min(rate, 1.0)))
+
+    def should_log(self, node_name: str) -> bool:
+        interval = self._interval(node_name)
+        if interval == 0:
+            return False
+        if interval == 1:
+            return True
+
+        with self._lock:
+            count = self._counters.get(node_name, 0)
+            self._counters[node_name] = count + 1
+        return count % interval == 0
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """
+    Parse a per-node sampling spec such as "sentiment-node=0.1,example-node=0.5".
+    """
+    rates = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, sep, rate = item.partition("=")
+        if not sep or not name.strip():
+            raise ValueError(f"Invalid sample rate entry: '{item}'")
+        try:
+            rates[name.strip()] = float(rate)
+        except ValueError:
+            raise ValueError(f"Invalid sample rate entry: '{item}'") from None
+    return rates
+
+
+def sampler_from_env() -> NodeLogSampler:
+    """
+    Build the access log sampler from NOXUS_LOG_SAMPLE_RATE(S).
+
+    Raises:
+        ValueError: If either variable is malformed
+    """
+    default_rate = os.environ.get("NOXUS_LOG_SAMPLE_RATE", "1.0")
+    try:
+        default_rate = float(default_rate)
+    except ValueError:
+        raise ValueError(f"Invalid NOXUS_LOG_SAMPLE_RATE: '{default_rate}'") from None
+
+    try:
+        rates = parse_sample_rates(os.environ.get("NOXUS_LOG_SAMPLE_RATES", ""))
+    except ValueError as e:
+        raise ValueError(f"Invalid NOXUS_LOG_SAMPLE_RATES: {e}") from None
+
+    return NodeLogSampler(default_rate=default_rate, rates=rates)
+
+
+def configure_logging(level: str = None) -> str:
+    """
+    Route Noxus loggers through a queue flushed by a background thread.
+
+    Args:
+        level: One of LOG_LEVELS; defaults to NOXUS_LOG_LEVEL or info
+
+    Returns:
+        The effective log level name, in lowercase
+
+    Raises:
+        ValueError: If the level is not one of LOG_LEVELS
+    """
+    global _listener, _queue_handler
+
+    level = (level or os.environ.get("NOXUS_LOG_LEVEL") or DEFAULT_LEVEL).lower()
+    if level not in LOG_LEVELS:
+        raise ValueError(
+            f"Unknown log level: '{level}'. Choose from: {', '.join(LOG_LEVELS)}"
+        )
+
+    if _listener is None:
+        log_queue = queue.SimpleQueue()
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(JsonFormatter())
+        _listener = QueueListener(log_queue, stream_handler)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+        _queue_handler = StructuredQueueHandler(log_queue)
+        for name in NOXUS_LOGGERS:
+            logger = logging.getLogger(name)
+            logger.addHandler(_queue_handler)
+            logger.propagate = False
+
+    for name in NOXUS_LOGGERS:
+        logging.getLogger(name).setLevel(level.upper())
+
+    return level
+
+
+def shutdown_logging():
+    """Flush pending records and stop the background listener."""
+    global _listener, _queue_handler
+
+    if _listener is None:
+        return
+
+    for name in NOXUS_LOGGERS:
+        logger = logging.getLogger(name)
+        logger.removeHandler(_queue_handler)
+        logger.propagate = True
+
+    _listener.stop()
+    _listener = None
+    _queue_handler = None
+    atexit.unregister(shutdown_logging)
@@ -1,17 +1,30 @@
 import inspect
+import logging
+import time
 from typing import Any, Dict, get_type_hints
 
 import uvicorn
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import HTMLResponse, JSONResponse
 from pydantic import BaseModel
 
 from domain.nodes import get_all_nodes
 from domain.plugins import Plugin, get_plugins_info
 
+from .accounting import NodeDisabledError, NodeResourceError, ResourceAccountant
+from .log import ACCESS_LOGGER, NodeLogSampler, configure_logging, sampler_from_env
+
+logger = logging.getLogger(__name__)
+access_logger = logging.getLogger(ACCESS_LOGGER)
+
+NODE_RUN_PATH = "/{node_name}/run"
+
 # Setting up globals for the server
 all_plugins = []
 all_nodes = []
+access_sampler = NodeLogSampler()
+accountant = ResourceAccountant()
 
 
 class NodeRunRequest(BaseModel):
@@ -79,6 +92,19 @@ def get_node_inputs_json(node) -> str:
     return f'{{\n  "inputs": {{\n{inputs_content}\n  }}\n}}'
 
 
+def render_node_result(result: Any) -> JSONResponse:
+    """
+    Render a node result the way FastAPI renders a returned dict, so the
+    response body is serialized once and its size can be checked.
+    """
+    try:
+        content = jsonable_encoder({"result": result, "status": "success"})
+    except ValueError as e:
+        # Not a client error, unlike the ValueErrors run_node maps to 400
+        raise TypeError(f"Node result is not JSON serializable: {e}") from e
+    return JSONResponse(content=content)
+
+
 # Initialize FastAPI app with OpenAPI documentation
 app = FastAPI(
     title="Noxus API",
@@ -106,6 +132,7 @@ async def root():
                 <li><a href="/docs">Swagger UI Documentation</a></li>
                 <li><a href="/redoc">ReDoc Documentation</a></li>
                 <li><a href="/manifest">View Plugins (JSON)</a></li>
+                <li><a href="/admin/nodes/stats">Node Resource Stats (JSON)</a></li>
             </ul>
         </body>
     </html>
@@ -115,7 +142,7 @@ async def root():
 @app.get("/manifest", response_class=HTMLResponse)
 async def manifest():
     """Dynamic manifest endpoint showing loaded plugin and nodes"""
-    print(f"Plugin loaded: {all_plugins}")
+    logger.debug("Plugin loaded: %s", all_plugins)
     plugin_info = get_plugins_info(all_plugins)
 
     plugins_html = ""
@@ -162,8 +189,71 @@ async def manifest():
     """
 
 
-@app.post("/{node_name}/run")
-async def run_node(node_name: str, request_data: NodeRunRequest):
+@app.get("/admin/nodes/stats")
+async def node_stats():
+    """
+    Per-node resource accounting (CPU time, wall time, payload sizes, allocations)
+    """
+    return accountant.snapshot()
+
+
+@app.post("/admin/nodes/{node_name}/reset")
+async def reset_node_stats(node_name: str):
+    """
+    Lift a node's memory alert and re-enable it if it was disabled
+    """
+    if not accountant.reset_node(node_name):
+        raise HTTPException(
+            status_code=404, detail=f"No resource stats for node '{node_name}'"
+        )
+    return {"status": "success"}
+
+
+@app.middleware("http")
+async def access_log(request: Request, call_next):
+    """
+    Write a JSON access record for every request.
+
+    Node runs are sampled per node and carry the timings run_node stores on
+    request.state; failures and all other routes are always logged.
+    """
+    start = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        node_name = None
+        if getattr(route, "path", None) == NODE_RUN_PATH:
+            node_name = request.scope.get("path_params", {}).get("node_name")
+
+        logged = (
+            node_name is None
+            or status_code >= 400
+            or access_sampler.should_log(node_name)
+        )
+        if logged:
+            record = {
+                "method": request.method,
+                "path": request.url.path,
+                "status_code": status_code,
+                "total_ms": round((time.perf_counter() - start) * 1000, 3),
+            }
+            if node_name is not None:
+                record["node"] = node_name
+                record.update(getattr(request.state, "timings", {}))
+
+            access_logger.log(
+                logging.WARNING if status_code >= 400 else logging.INFO,
+                "Request",
+                extra=record,
+            )
+
+
+@app.post(NODE_RUN_PATH)
+async def run_node(node_name: str, request_data: NodeRunRequest, request: Request):
     """
     Execute a node by name with provided arguments
     """
@@ -177,28 +267,73 @@ async def run_node(node_name: str, request_data: NodeRunRequest):
             detail=f"Node '{node_name}' not found. Available nodes: {', '.join(available_nodes)}",
         )
 
+    start = time.perf_counter()
+    request.state.timings = timings = {}
     try:
         # Validate that inputs contain all required parameters
         validated_inputs = validate_node_inputs(target_node, request_data.inputs)
+        call_start = time.perf_counter()
+        timings["validate_ms"] = round((call_start - start) * 1000, 3)
 
         # Call the node with validated inputs
-        result = target_node.call(**validated_inputs)
-
-        return {"result": result, "status": "success"}
+        content_length = request.headers.get("content-length")
+        try:
+            return accountant.call_node(
+                node_name,
+                target_node,
+                validated_inputs,
+                render=render_node_result,
+                request_bytes=int(content_length) if content_length else None,
+            )
+        finally:
+            timings["call_ms"] = round((time.perf_counter() - call_start) * 1000, 3)
 
     except ValueError as e:
         # Parameter validation error
         raise HTTPException(status_code=400, detail=str(e))
+    except NodeDisabledError as e:
+        # Node was contained after tripping a resource guard
+        raise HTTPException(status_code=503, detail=str(e))
+    except NodeResourceError as e:
+        # Node result violated a resource guard
+        raise HTTPException(status_code=502, detail=str(e))
     except Exception as e:
         # Execution error
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def configure_server(log_level: str = None) -> str:
+    """
+    Configure logging, access log sampling and resource accounting.
+
+    Called by start_server; call it beforehand to validate the configuration
+    without starting the server. Safe to call more than once.
+
+    Args:
+        log_level: Log level name (defaults to NOXUS_LOG_LEVEL or info)
+
+    Returns:
+        The effective log level name
+
+    Raises:
+        ValueError: If the log level or a NOXUS_* environment variable is invalid
+    """
+    global access_sampler, accountant
+    sampler = sampler_from_env()
+    resource_accountant = ResourceAccountant.from_env()
+    log_level = configure_logging(log_level)
+
+    access_sampler = sampler
+    accountant = resource_accountant
+    return log_level
+
+
 def start_server(
     host: str = "127.0.0.1",
     port: int = 8000,
     reload: bool = False,
     plugin: Plugin = None,
+    log_level: str = None,
 ):
     """
     Start the server
@@ -208,17 +343,28 @@ def start_server(
         port: Port to bind to
         reload: Enable auto-reload for development
         plugin: Single plugin to load
+        log_level: Log level name (defaults to NOXUS_LOG_LEVEL or info)
+
+    Raises:
+        ValueError: If the log level or a NOXUS_* environment variable is invalid
     """
     global all_plugins, all_nodes
-    print(f"Plugin loaded: {plugin}")
+    log_level = configure_server(log_level)
+
+    logger.info("Plugin loaded: %s", plugin)
     all_plugins = [plugin]
     all_nodes = get_all_nodes(plugin.nodes())
 
-    for name in all_nodes:
-        print(f"  - {name}")
-
     uvicorn.run(
-        "http_server.server:app", host=host, port=port, reload=reload, log_level="info"
+        "http_server.server:app",
+        host=host,
+        port=port,
+        reload=reload,
+        log_level=log_level,
+        # Keep our queue handlers on the uvicorn loggers; the access_log
+        # middleware replaces uvicorn's synchronous per-request lines
+        log_config=None,
+        access_log=False,
     )
 
 
@@ -1,5 +1,7 @@
 import argparse
 
+from http_server.log import LOG_LEVELS
+
 from .commands.build import build_command
 from .commands.init import init_command
 from .commands.serve import serve_command
@@ -23,6 +25,11 @@ def main():
         "--port", type=int, default=8000, help="Port to bind to (default: 8000)"
     )
     serve_parser.add_argument("--plugin", help="Path to plugin YAML configuration file")
+    serve_parser.add_argument(
+        "--log-level",
+        choices=LOG_LEVELS,
+        help="Server log level (default: NOXUS_LOG_LEVEL or info)",
+    )
     serve_parser.set_defaults(func=serve_command)
 
     # "build" command
@@ -1,4 +1,4 @@
-from http_server.server import start_server
+from http_server.server import configure_server, start_server
 
 from ..utils import load_plugin_from_yaml
 
@@ -21,4 +21,10 @@ def serve_command(args):
     print(f"  - ReDoc: http://{args.host}:{args.port}/redoc")
 
     if plugin:
-        start_server(host=args.host, port=args.port, plugin=plugin)
\ No newline at end of file
+        try:
+            log_level = configure_server(args.log_level)
+        except ValueError as e:
+            print(f"Invalid server configuration: {e}")
+            return
+
+        start_server(host=args.host, port=args.port, plugin=plugin, log_level=log_level)
\ No newline at end of file
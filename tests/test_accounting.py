@@ -0,0 +1,274 @@
+import json
+import tracemalloc
+from dataclasses import asdict, dataclass, is_dataclass
+
+import pytest
+
+from domain.nodes import SentimentNode
+from http_server.accounting import (
+    NodeDisabledError,
+    NodeResourceError,
+    ResourceAccountant,
+)
+
+SENTIMENT_INPUTS = {"arg1": "a", "arg2": "b"}
+
+MODULE_CACHE = {"rows": [{"i": i, "s": "x" * i} for i in range(500)]}
+
+
+class Rendered:
+    def __init__(self, body: bytes):
+        self.body = body
+
+
+def render(result) -> Rendered:
+    def encode(value):
+        if is_dataclass(value):
+            return asdict(value)
+        raise TypeError(f"Cannot encode {value!r}")
+
+    return Rendered(json.dumps({"result": result}, default=encode).encode("utf-8"))
+
+
+@dataclass
+class Score:
+    value: float
+
+
+class ObjectResultNode:
+    name = "object-node"
+
+    def call(self):
+        return {"r": Score(0.8)}
+
+
+class ModuleCacheNode:
+    name = "cache-node"
+
+    def call(self):
+        return MODULE_CACHE
+
+
+class LeakyNode:
+    name = "leaky-node"
+
+    def __init__(self):
+        self.leaked = []
+
+    def call(self, size: int):
+        self.leaked.append(bytearray(size))
+        return {"ok": True}
+
+
+class PerInputCacheNode:
+    """Caches 200KB per new key; every fifth call hits the same hot key."""
+
+    name = "per-input-cache-node"
+
+    def __init__(self):
+        self.cache = {}
+        self.calls = 0
+
+    def call(self):
+        self.calls += 1
+        key = "hot" if self.calls % 5 == 0 else self.calls
+        if key not in self.cache:
+            self.cache[key] = bytearray(200_000)
+        return {"key": str(key)}
+
+
+class LazyInitNode:
+    name = "lazy-node"
+
+    def __init__(self):
+        self.cache = None
+        self.calls = 0
+
+    def call(self):
+        self.calls += 1
+        # Allocated once, on a call that is sampled
+        if self.calls == 2:
+            self.cache = bytearray(1_000_000)
+        return {"calls": self.calls}
+
+
+class BigResultNode:
+    name = "big-node"
+
+    def call(self, size: int):
+        return {"items": [{"i": i, "s": "x" * i} for i in range(size)]}
+
+
+def make_accountant(**kwargs) -> ResourceAccountant:
+    kwargs.setdefault("enabled", True)
+    kwargs.setdefault("alloc_sample_rate", 1.0)
+    return ResourceAccountant(**kwargs)
+
+
+def call(accountant, node, inputs=None, **kwargs):
+    return accountant.call_node(node.name, node, inputs or {}, render, **kwargs)
+
+
+def test_disabled_accountant_only_renders():
+    accountant = ResourceAccountant()
+
+    response = call(accountant, SentimentNode(), SENTIMENT_INPUTS)
+
+    assert json.loads(response.body)["result"]["sentiment"] == "positive"
+    assert accountant.snapshot() == {"enabled": False, "nodes": {}}
+
+
+def test_records_calls_and_payload_sizes():
+    accountant = make_accountant()
+    node = SentimentNode()
+
+    for _ in range(3):
+        response = call(accountant, node, SENTIMENT_INPUTS, request_bytes=10)
+
+    stats = accountant.snapshot()["nodes"][node.name]
+    assert stats["calls"] == 3
+    assert stats["request_bytes"] == 30
+    assert stats["responses"] == 3
+    assert stats["max_response_bytes"] == len(response.body)
+    # The first call is never sampled
+    assert stats["alloc_samples"] == 2
+
+
+@pytest.mark.parametrize(
+    "node, inputs",
+    [
+        (SentimentNode(), SENTIMENT_INPUTS),
+        (BigResultNode(), {"size": 500}),
+        (ObjectResultNode(), {}),
+        (ModuleCacheNode(), {}),
+    ],
+)
+def test_returned_result_is_not_counted_as_growth(node, inputs):
+    accountant = make_accountant(memory_alert_bytes=10_000, alloc_window=5)
+
+    for _ in range(11):
+        call(accountant, node, inputs)
+
+    stats = accountant.snapshot()["nodes"][node.name]
+    assert not stats["memory_alert"]
+    assert abs(stats["alloc_avg_retained_bytes"]) < 1_000
+
+
+def test_leak_is_detected_when_result_holds_a_custom_object():
+    class LeakyObjectNode(ObjectResultNode):
+        leaked = []
+
+        def call(self):
+            self.leaked.append(bytearray(50_000))
+            return super().call()
+
+    accountant = make_accountant(memory_alert_bytes=200_000, alloc_window=5)
+    node = LeakyObjectNode()
+
+    for _ in range(6):
+        call(accountant, node)
+
+    stats = accountant.snapshot()["nodes"][node.name]
+    assert stats["alloc_avg_retained_bytes"] > 45_000
+    assert stats["memory_alert"]
+
+
+def test_one_off_allocation_does_not_trip_alert():
+    accountant = make_accountant(memory_alert_bytes=100_000, alloc_window=5)
+    node = LazyInitNode()
+
+    for _ in range(20):
+        call(accountant, node)
+
+    assert not accountant.snapshot()["nodes"][node.name]["memory_alert"]
+
+
+def test_leak_that_does_not_grow_on_every_call_trips_alert():
+    accountant = make_accountant(memory_alert_bytes=1_000_000, alloc_window=10)
+    node = PerInputCacheNode()
+
+    for _ in range(11):
+        call(accountant, node)
+
+    assert accountant.snapshot()["nodes"][node.name]["memory_alert"]
+
+
+def test_leak_trips_alert_disables_node_and_can_be_reset():
+    accountant = make_accountant(
+        memory_alert_bytes=50_000, alloc_window=5, disable_on_memory_alert=True
+    )
+    node = LeakyNode()
+
+    with pytest.raises(NodeDisabledError):
+        for _ in range(20):
+            call(accountant, node, {"size": 20_000})
+
+    stats = accountant.snapshot()["nodes"][node.name]
+    assert stats["memory_alert"]
+    assert stats["disabled"]
+    # Initial call plus a full window of sampled calls
+    assert stats["calls"] == 6
+
+    assert accountant.reset_node(node.name)
+    assert json.loads(call(accountant, node, {"size": 1}).body) == {
+        "result": {"ok": True}
+    }
+    assert not accountant.reset_node("unknown-node")
+
+
+def test_sampled_growth_is_extrapolated_to_unsampled_calls():
+    accountant = make_accountant(
+        alloc_sample_rate=0.5, memory_alert_bytes=150_000, alloc_window=5
+    )
+    node = LeakyNode()
+
+    for _ in range(11):
+        call(accountant, node, {"size": 20_000})
+
+    # 5 sampled calls retained ~100KB, standing for ~200KB over 10 calls
+    stats = accountant.snapshot()["nodes"][node.name]
+    assert stats["alloc_growth_bytes"] > 150_000
+    assert stats["memory_alert"]
+
+
+def test_peak_is_measured_per_call_when_already_tracing():
+    if not hasattr(tracemalloc, "reset_peak"):
+        pytest.skip("tracemalloc.reset_peak needs Python 3.9+")
+
+    accountant = make_accountant()
+    tracemalloc.start()
+    try:
+        bytearray(10_000_000)
+        for _ in range(2):
+            call(accountant, SentimentNode(), SENTIMENT_INPUTS)
+    finally:
+        tracemalloc.stop()
+
+    stats = accountant.snapshot()["nodes"]["sentiment-node"]
+    assert stats["alloc_peak_bytes"] < 100_000
+
+
+def test_max_response_bytes_guard_checks_rendered_body():
+    accountant = make_accountant(alloc_sample_rate=0, max_response_bytes=1_000)
+    node = BigResultNode()
+
+    assert call(accountant, node, {"size": 5})
+    with pytest.raises(NodeResourceError, match="exceeds limit"):
+        call(accountant, node, {"size": 500})
+
+    stats = accountant.snapshot()["nodes"][node.name]
+    assert stats["guard_violations"] == 1
+    assert stats["responses"] == 2
+
+
+def test_from_env_reports_variable_name(monkeypatch):
+    monkeypatch.setenv("NOXUS_ACCOUNTING", "1")
+    monkeypatch.setenv("NOXUS_MAX_RESPONSE_BYTES", "1MB")
+
+    with pytest.raises(ValueError, match="NOXUS_MAX_RESPONSE_BYTES"):
+        ResourceAccountant.from_env()
+
+    monkeypatch.setenv("NOXUS_MAX_RESPONSE_BYTES", "1000")
+    accountant = ResourceAccountant.from_env()
+    assert accountant.enabled
+    assert accountant.max_response_bytes == 1000
@@ -0,0 +1,113 @@
+import json
+import logging
+import queue
+import sys
+
+import pytest
+
+from http_server.log import (
+    JsonFormatter,
+    NodeLogSampler,
+    StructuredQueueHandler,
+    configure_logging,
+    parse_sample_rates,
+    sampler_from_env,
+)
+
+
+def make_record(**extra) -> logging.LogRecord:
+    record = logging.LogRecord(
+        "http_server.access", logging.INFO, __file__, 1, "Node run %s", ("ok",), None
+    )
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_includes_extras():
+    entry = json.loads(
+        JsonFormatter().format(make_record(node="sentiment-node", call_ms=1.5))
+    )
+
+    assert entry["message"] == "Node run ok"
+    assert entry["logger"] == "http_server.access"
+    assert entry["level"] == "INFO"
+    assert entry["node"] == "sentiment-node"
+    assert entry["call_ms"] == 1.5
+
+
+def test_json_formatter_timestamp_is_utc_with_milliseconds():
+    record = make_record()
+    record.created = 0.25
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["ts"] == "1970-01-01T00:00:00.250+00:00"
+
+
+def test_queued_traceback_is_kept_out_of_the_message():
+    log_queue = queue.SimpleQueue()
+    handler = StructuredQueueHandler(log_queue)
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        record = make_record()
+        record.exc_info = sys.exc_info()
+    handler.handle(record)
+
+    entry = json.loads(JsonFormatter().format(log_queue.get_nowait()))
+
+    assert entry["message"] == "Node run ok"
+    assert "ZeroDivisionError" in entry["exc_info"]
+
+
+def test_json_formatter_skips_reserved_and_uvicorn_color_message():
+    entry = json.loads(JsonFormatter().format(make_record(color_message="\x1b[32m")))
+
+    assert "color_message" not in entry
+    assert "args" not in entry
+    assert "msg" not in entry
+
+
+def test_sampler_logs_every_nth_request_per_node():
+    sampler = NodeLogSampler(default_rate=0.25, rates={"busy-node": 0.5})
+
+    node_decisions = [sampler.should_log("node") for _ in range(8)]
+    busy_decisions = [sampler.should_log("busy-node") for _ in range(4)]
+
+    assert node_decisions == [True, False, False, False] * 2
+    assert busy_decisions == [True, False] * 2
+
+
+def test_sampler_rate_bounds():
+    sampler = NodeLogSampler(default_rate=0, rates={"always": 5.0})
+
+    assert not any(sampler.should_log("node") for _ in range(10))
+    assert all(sampler.should_log("always") for _ in range(10))
+
+
+def test_parse_sample_rates():
+    assert parse_sample_rates("") == {}
+    assert parse_sample_rates(" a=0.1, b=1 ,") == {"a": 0.1, "b": 1.0}
+
+
+@pytest.mark.parametrize("spec", ["a", "=0.1", "a=fast"])
+def test_parse_sample_rates_rejects_malformed_entries(spec):
+    with pytest.raises(ValueError, match="Invalid sample rate entry"):
+        parse_sample_rates(spec)
+
+
+def test_sampler_from_env_reports_variable_name(monkeypatch):
+    monkeypatch.setenv("NOXUS_LOG_SAMPLE_RATE", "often")
+    with pytest.raises(ValueError, match="NOXUS_LOG_SAMPLE_RATE"):
+        sampler_from_env()
+
+    monkeypatch.setenv("NOXUS_LOG_SAMPLE_RATE", "0.5")
+    monkeypatch.setenv("NOXUS_LOG_SAMPLE_RATES", "a")
+    with pytest.raises(ValueError, match="NOXUS_LOG_SAMPLE_RATES"):
+        sampler_from_env()
+
+
+@pytest.mark.parametrize("level", ["warn", "fatal", "notset", "verbose"])
+def test_configure_logging_rejects_levels_unknown_to_uvicorn(level):
+    with pytest.raises(ValueError, match="Unknown log level"):
+        configure_logging(level)
@@ -0,0 +1,125 @@
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+
+from domain.nodes import get_all_nodes
+from domain.plugins import SentimentPlugin
+from http_server import server
+from http_server.accounting import ResourceAccountant
+from http_server.log import ACCESS_LOGGER, NodeLogSampler
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def access_records(monkeypatch):
+    plugin = SentimentPlugin()
+    monkeypatch.setattr(server, "all_plugins", [plugin])
+    monkeypatch.setattr(server, "all_nodes", get_all_nodes(plugin.nodes()))
+    monkeypatch.setattr(server, "access_sampler", NodeLogSampler())
+
+    handler = RecordingHandler()
+    access_logger = logging.getLogger(ACCESS_LOGGER)
+    access_logger.addHandler(handler)
+    access_logger.setLevel(logging.INFO)
+    yield handler.records
+    access_logger.removeHandler(handler)
+
+
+@pytest.fixture
+def client():
+    return TestClient(server.app, raise_server_exceptions=False)
+
+
+def test_node_run_record_has_node_and_timings(client, access_records):
+    response = client.post(
+        "/sentiment-node/run", json={"inputs": {"arg1": "a", "arg2": "b"}}
+    )
+
+    assert response.status_code == 200
+    (record,) = access_records
+    assert record.node == "sentiment-node"
+    assert record.status_code == 200
+    assert record.path == "/sentiment-node/run"
+    assert {"validate_ms", "call_ms", "total_ms"} <= set(record.__dict__)
+
+
+@pytest.mark.parametrize(
+    "method, path, body, status_code",
+    [
+        ("get", "/manifest", None, 200),
+        ("get", "/admin/nodes/stats", None, 200),
+        ("get", "/no/such/route", None, 404),
+        ("post", "/missing-node/run", {"inputs": {}}, 404),
+        ("post", "/sentiment-node/run", {"wrong": {}}, 422),
+        ("post", "/sentiment-node/run", {"inputs": {}}, 400),
+    ],
+)
+def test_every_request_is_logged(
+    client, access_records, method, path, body, status_code
+):
+    kwargs = {"json": body} if body else {}
+    response = getattr(client, method)(path, **kwargs)
+
+    assert response.status_code == status_code
+    (record,) = access_records
+    assert record.status_code == status_code
+    assert record.path == path
+
+
+def test_successful_node_runs_are_sampled_but_failures_are_not(
+    client, access_records, monkeypatch
+):
+    monkeypatch.setattr(server, "access_sampler", NodeLogSampler(default_rate=0.5))
+
+    for _ in range(4):
+        client.post(
+            "/sentiment-node/run", json={"inputs": {"arg1": "a", "arg2": "b"}}
+        )
+    for _ in range(2):
+        client.post("/sentiment-node/run", json={"inputs": {}})
+
+    assert [record.status_code for record in access_records] == [200, 200, 400, 400]
+
+
+def test_oversized_response_is_rejected(client, access_records, monkeypatch):
+    monkeypatch.setattr(
+        server, "accountant", ResourceAccountant(enabled=True, max_response_bytes=10)
+    )
+
+    response = client.post(
+        "/sentiment-node/run", json={"inputs": {"arg1": "a", "arg2": "b"}}
+    )
+
+    assert response.status_code == 502
+    stats = client.get("/admin/nodes/stats").json()["nodes"]["sentiment-node"]
+    assert stats["guard_violations"] == 1
+
+
+def test_unserializable_result_is_a_server_error(client, access_records, monkeypatch):
+    class CircularNode:
+        def call(self):
+            result = {}
+            result["self"] = result
+            return result
+
+    monkeypatch.setitem(server.all_nodes, "circular-node", CircularNode())
+
+    response = client.post("/circular-node/run", json={"inputs": {}})
+
+    assert response.status_code == 500
+
+
+def test_configure_server_rejects_invalid_env(monkeypatch):
+    monkeypatch.setenv("NOXUS_LOG_SAMPLE_RATES", "sentiment-node")
+
+    with pytest.raises(ValueError, match="NOXUS_LOG_SAMPLE_RATES"):
+        server.configure_server("info")